@@ -0,0 +1,294 @@
+"""
+Micro-benchmarks for the per-frame hot paths in detect.py and the menu renderers.
+
+Usage:
+    python benchmark.py                              # run everything and print a table
+    python benchmark.py --save-baseline base.json    # store the results as a baseline
+    python benchmark.py --baseline base.json         # compare, exit 1 on regression
+    python benchmark.py --fixtures recordings/session-...  # also run on recorded landmarks
+
+--fixtures takes a session recorded by gui.py (see recording.py and RECORDING_DIR).
+Its right-hand frames are grouped into poses by the finger states recorded with them.
+No recorded session or baseline ships with the repo: record them on the target
+device, since both depend on the hardware.
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import detect
+import gui
+from channels import open_channels_menu
+from changeSound import open_changesound_menu
+from injection import create_injector
+from recording import LandmarkRecording
+from settings import open_settings_menu
+from tracking import array_to_landmarks
+
+# Finger states (Thumb, Index, Middle, Ring, Pinky) for every gesture detect.py knows about
+POSES = {
+    "open_palm": [True, True, True, True, True],
+    "fist": [False, False, False, False, False],
+    "point": [False, True, False, False, False],
+    "click": [True, True, False, False, False],
+    "scroll_down": [False, True, True, False, False],
+    "scroll_up": [False, True, True, True, False],
+}
+
+RESOLUTIONS = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+}
+
+
+def synthetic_hand(finger_states, jitter=0.0, rng=None):
+    """
+    Build 21 normalized landmarks of a right hand (as seen after the mirror flip)
+    whose finger states match finger_states. jitter adds gaussian noise to every point.
+    """
+    points = np.zeros((21, 3))
+    wrist = np.array([0.5, 0.8, 0.0])
+    points[0] = wrist
+
+    # Thumb (1-4): open is a straight line out to the left, closed curls back inwards
+    if finger_states[0]:
+        step = np.array([-0.04, -0.027, 0.0])
+        for i in range(1, 5):
+            points[i] = wrist + i * step
+    else:
+        points[1:5] = wrist + np.array([
+            [-0.04, -0.03, 0.0],
+            [-0.06, -0.07, 0.0],
+            [-0.05, -0.11, 0.0],
+            [-0.02, -0.10, 0.0],
+        ])
+
+    # Other fingers: MCP, PIP, DIP, tip going up when open, curling below the PIP when closed
+    for finger, x_offset in enumerate([-0.03, -0.01, 0.01, 0.03], start=1):
+        mcp = wrist + np.array([x_offset, -0.15, 0.0])
+        if finger_states[finger]:
+            offsets = [0.0, -0.05, -0.08, -0.11]
+        else:
+            offsets = [0.0, -0.04, -0.02, 0.01]
+        base = 1 + finger * 4
+        for i, dy in enumerate(offsets):
+            points[base + i] = mcp + np.array([0.0, dy, 0.0])
+
+    if jitter:
+        rng = rng or np.random.default_rng(0)
+        points = points + rng.normal(0.0, jitter, points.shape)
+
+    return array_to_landmarks(points)
+
+
+def synthetic_fixtures(frames_per_pose=16, jitter=0.002):
+    """
+    Jittered synthetic frames for every pose, so branches are not perfectly predicted.
+    """
+    rng = np.random.default_rng(0)
+    return {
+        name: [synthetic_hand(states, jitter, rng) for _ in range(frames_per_pose)]
+        for name, states in POSES.items()
+    }
+
+
+def load_fixtures(path, frames_per_pose=64):
+    """
+    Load recorded right-hand frames from a LandmarkRecording directory, grouped by pose.
+    Up to frames_per_pose frames are taken per pose, spread evenly across the session.
+    """
+    recording = LandmarkRecording(path)
+    pose_names = {tuple(states): name for name, states in POSES.items()}
+
+    indices = {}
+    for i in range(len(recording)):
+        if not recording.columns["tracked_present"][i, 0]:
+            continue
+        states = tuple(bool(state) for state in recording.columns["finger_states"][i])
+        pose = pose_names.get(states)
+        if pose is not None:
+            indices.setdefault(pose, []).append(i)
+
+    fixtures = {}
+    for pose, frame_indices in indices.items():
+        step = max(len(frame_indices) // frames_per_pose, 1)
+        fixtures[pose] = [recording.hands(i)[0] for i in frame_indices[::step][:frames_per_pose]]
+    return fixtures
+
+
+def measure(func, calls, min_time=0.2, repeats=3, alloc_samples=50):
+    """
+    Time func over the list of argument tuples in calls.
+    Returns ops/sec (best of repeats) and mean peak bytes allocated per call.
+    """
+    # Calibrate how many passes over calls fill min_time
+    passes = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(passes):
+            for args in calls:
+                func(*args)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        passes *= 2
+
+    best = elapsed
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(passes):
+            for args in calls:
+                func(*args)
+        best = min(best, time.perf_counter() - start)
+    ops_per_sec = passes * len(calls) / best
+
+    tracemalloc.start()
+    total_peak = 0
+    for i in range(alloc_samples):
+        args = calls[i % len(calls)]
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        func(*args)
+        total_peak += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    return ops_per_sec, total_peak / alloc_samples
+
+
+def landmark_benchmarks(fixtures, label):
+    """
+    Yield (name, func, calls) for the detect.py hot paths on every pose in fixtures.
+    """
+    frame_width, frame_height = RESOLUTIONS["720p"]
+    for pose, frames in fixtures.items():
+        yield (f"thumb_linearity_check[{label}:{pose}]", detect.thumb_linearity_check,
+               [(frame[:5],) for frame in frames])
+        yield (f"get_finger_states[{label}:{pose}]", detect.get_finger_states,
+               [(frame, "Right") for frame in frames])
+        yield (f"distance_between_points[{label}:{pose}]", detect.distance_between_points,
+               [(frame[4], frame[8]) for frame in frames])
+
+        gesture_calls = []
+        for frame in frames:
+            states = detect.get_finger_states(frame, "Right")
+            gesture_calls.append((frame, "Right", states, frame_width, frame_height))
+        yield (f"perform_gesture_actions[{label}:{pose}]", detect.perform_gesture_actions, gesture_calls)
+
+
+def _draw_menu_button(frame, cursor_position):
+    gui.show_menu = False
+    gui.current_menu = None
+    gui.draw_menu_button(frame, cursor_position, False)
+
+
+def _draw_circular_selector(frame, cursor_position):
+    gui.show_menu = True
+    gui.current_menu = None
+    gui.draw_circular_selector(frame, cursor_position, False)
+
+
+def _submenu(open_menu):
+    def render(frame, cursor_position):
+        open_menu(frame, cursor_position, False, lambda menu_name: None, {})
+    return render
+
+
+def menu_benchmarks():
+    """
+    Yield (name, func, calls) for every menu renderer at each resolution, with the
+    cursor both hovering a control and resting on empty space.
+    """
+    renderers = {
+        "draw_menu_button": (_draw_menu_button, lambda w, h: (100, 110)),
+        "draw_circular_selector": (_draw_circular_selector, lambda w, h: (w // 2 + h // 3, h // 2 + 10)),
+        "open_channels_menu": (_submenu(open_channels_menu), lambda w, h: (400, 250)),
+        "open_changesound_menu": (_submenu(open_changesound_menu), lambda w, h: (200, 110)),
+        "open_settings_menu": (_submenu(open_settings_menu), lambda w, h: (200, 110)),
+    }
+    for res_name, (width, height) in RESOLUTIONS.items():
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        for name, (render, hover_position) in renderers.items():
+            calls = [(frame, hover_position(width, height)), (frame, (width - 5, height - 5))]
+            yield f"{name}[{res_name}]", render, calls
+
+
+def compare(results, baseline, threshold, alloc_threshold):
+    """
+    Return a list of regression messages for results that fall outside the thresholds.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: {result['ops_per_sec']:.0f} ops/s vs baseline {base['ops_per_sec']:.0f} ops/s")
+        # Small absolute slack so a few bytes of allocator noise on tiny functions don't fail the run
+        if result["alloc_bytes"] > base["alloc_bytes"] * (1 + alloc_threshold) + 64:
+            regressions.append(
+                f"{name}: {result['alloc_bytes']:.0f} B/call vs baseline {base['alloc_bytes']:.0f} B/call")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-frame hot paths.")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--fixtures", help="Recording directory (see recording.py) to also benchmark on real landmarks")
+    parser.add_argument("--baseline", help="Compare against this baseline JSON file")
+    parser.add_argument("--save-baseline", help="Write the results to this baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Allowed ops/sec slowdown as a fraction of the baseline (default 0.15)")
+    parser.add_argument("--alloc-threshold", type=float, default=0.25,
+                        help="Allowed allocation growth as a fraction of the baseline (default 0.25)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timing run (default 0.2)")
+    args = parser.parse_args()
+
+    # Cursor moves and clicks go to a backend that drops them, never to the real cursor.
+    # Synchronous, so no worker thread competes for the GIL or shows up in tracemalloc.
+    detect.set_input_injector(create_injector("null", synchronous=True))
+
+    benchmarks = list(landmark_benchmarks(synthetic_fixtures(), "synthetic"))
+    if args.fixtures:
+        benchmarks += list(landmark_benchmarks(load_fixtures(args.fixtures), "recorded"))
+    benchmarks += list(menu_benchmarks())
+
+    results = {}
+    print(f"{'benchmark':<60} {'ops/sec':>12} {'B/call':>10}")
+    for name, func, calls in benchmarks:
+        if args.filter not in name:
+            continue
+        # The gesture and menu code prints on every action; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            ops_per_sec, alloc_bytes = measure(func, calls, min_time=args.min_time)
+        results[name] = {"ops_per_sec": ops_per_sec, "alloc_bytes": alloc_bytes}
+        print(f"{name:<60} {ops_per_sec:>12.0f} {alloc_bytes:>10.0f}")
+    detect.get_input_injector().close()
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.alloc_threshold)
+        if regressions:
+            print("Regressions:")
+            for message in regressions:
+                print("  " + message)
+            return 1
+        print("No regressions against baseline.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,8 @@ import mediapipe as mp
 from mediapipe.framework.formats import landmark_pb2
 from mediapipe.tasks.python import vision
 from mediapipe.tasks.python import BaseOptions
-import pyautogui
+
+from injection import create_injector
 
 
 MARGIN = 10  # pixels
@@ -12,6 +13,27 @@ FONT_SIZE = 2
 FONT_THICKNESS = 2
 HANDEDNESS_TEXT_COLOR = (88, 205, 54)  # vibrant green
 
+INPUT_BACKEND = "pyautogui"  # See injection.BACKENDS
+input_injector = None  # Created on first use so importing this module starts no threads
+
+
+def get_input_injector():
+    """
+    Return the shared asynchronous input injector, creating it with INPUT_BACKEND if needed.
+    """
+    global input_injector
+    if input_injector is None:
+        input_injector = create_injector(INPUT_BACKEND)
+    return input_injector
+
+
+def set_input_injector(injector):
+    """
+    Replace the shared input injector (e.g. with a recording backend for benchmarks or replays).
+    """
+    global input_injector
+    input_injector = injector
+
 def thumb_linearity_check(points):
     """
     Check linearity of points 0, 1, 2, 3, 4 of the thumb.
@@ -82,25 +104,37 @@ def distance_between_points(point1, point2):
 def move_cursor_with_index_finger(index_tip, frame_width, frame_height):
     cursor_x = int(index_tip.x * frame_width)
     cursor_y = int((index_tip.y * frame_height)+50)
-    pyautogui.moveTo(cursor_x, cursor_y)
+    get_input_injector().move_to(cursor_x, cursor_y)
 
 
-def draw_landmarks_on_image(rgb_image, detection_result):
+def draw_landmarks_on_image(rgb_image, detection_result, annotation_level=2):
+    """
+    Draw the detected hands on a copy of the image.
+    annotation_level: 0 = nothing, 1 = hand skeleton only, 2 = skeleton plus handedness and finger labels.
+    """
     if detection_result.hand_landmarks is None:
         return rgb_image
 
-    annotated_image = np.copy(rgb_image)
+    hands = []
+    for idx, hand_landmarks in enumerate(detection_result.hand_landmarks):
+        handedness = detection_result.handedness[idx][0].category_name  # Access handedness
+        corrected_handedness = "Right" if handedness == "Left" else "Left"
+        hands.append((hand_landmarks, corrected_handedness))
 
-    hand_landmarks_list = detection_result.hand_landmarks
-    handedness_list = detection_result.handedness
+    return draw_hands_on_image(rgb_image, hands, annotation_level)
 
-    for idx in range(len(hand_landmarks_list)):
-        hand_landmarks = hand_landmarks_list[idx]
-        handedness = handedness_list[idx][0].category_name  # Access handedness
-        corrected_handedness = "Right" if handedness == "Left" else "Left"
 
-        finger_states = get_finger_states(hand_landmarks, corrected_handedness)
+def draw_hands_on_image(rgb_image, hands, annotation_level=2):
+    """
+    Draw (hand_landmarks, corrected_handedness) pairs on a copy of the image, e.g. the
+    filtered or predicted hands that drive the cursor this frame.
+    """
+    if not hands or annotation_level == 0:
+        return rgb_image
 
+    annotated_image = np.copy(rgb_image)
+
+    for hand_landmarks, corrected_handedness in hands:
         hand_landmarks_proto = landmark_pb2.NormalizedLandmarkList()
         hand_landmarks_proto.landmark.extend([
             landmark_pb2.NormalizedLandmark(
@@ -113,6 +147,11 @@ def draw_landmarks_on_image(rgb_image, detection_result):
             mp.solutions.drawing_styles.get_default_hand_landmarks_style(),
             mp.solutions.drawing_styles.get_default_hand_connections_style())
 
+        if annotation_level < 2:
+            continue
+
+        finger_states = get_finger_states(hand_landmarks, corrected_handedness)
+
         height, width, _ = annotated_image.shape
         x_coordinates = [landmark.x for landmark in hand_landmarks]
         y_coordinates = [landmark.y for landmark in hand_landmarks]
@@ -146,9 +185,12 @@ def draw_landmarks_on_image(rgb_image, detection_result):
     return annotated_image
 
 
-def perform_gesture_actions(controlling_hand, controlling_handedness, finger_states, frame_width, frame_height):
+def perform_gesture_actions(controlling_hand, controlling_handedness, finger_states, frame_width, frame_height,
+                            predicted=False):
     """
     Perform actions (cursor move, click, scroll, drag) based on finger states.
+    When predicted is True the hand comes from the motion model rather than a real
+    detection, so only the cursor is moved and no click/scroll is triggered.
     """
     actions = {
         "click": False,
@@ -162,9 +204,12 @@ def perform_gesture_actions(controlling_hand, controlling_handedness, finger_sta
             index_tip = controlling_hand[8]
             move_cursor_with_index_finger(index_tip, frame_width, frame_height)
 
+        if predicted:
+            return actions
+
         # Click if thumb and index are open, and others closed
         if finger_states[0] and finger_states[1] and all(not state for state in finger_states[2:]):
-            pyautogui.click()
+            get_input_injector().click()
             print("Clicked")
             actions["click"] = True
 
@@ -1,21 +1,47 @@
 import cv2
 import math
+import os
+import time
 import numpy as np
-import pyautogui
 import mediapipe as mp
 from mediapipe.tasks.python import vision
 from mediapipe.tasks.python import BaseOptions
 
 from detect import (
     get_finger_states,
-    draw_landmarks_on_image,
-    perform_gesture_actions
+    draw_hands_on_image,
+    perform_gesture_actions,
+    get_input_injector,
+    set_input_injector
 )
 
 # Import submenu handlers
 from channels import open_channels_menu
 from changeSound import open_changesound_menu
 from settings import open_settings_menu
+from tracking import LandmarkPredictor
+from quality import QualityController, resolve_model_path
+from recording import LandmarkRecorder
+from streaming import MJPEGStreamer
+from injection import create_injector
+
+# Inference rate (detections per second). Frames in between use the motion model
+# so the cursor and hover feedback still update at display rate.
+INFERENCE_FPS = 15
+
+# Per-frame processing budget in seconds; the quality controller adjusts hands,
+# input scale, model and overlay detail at runtime to stay within it.
+FRAME_TIME_BUDGET = 1.0 / 30
+
+# Directory to record every session's landmarks, finger states and actions into
+# (see recording.py), or None to disable recording.
+RECORDING_DIR = None
+
+# Port to serve the annotated frame as an MJPEG stream on the LAN, or None to disable.
+# Units without a desktop should also set SHOW_WINDOW = False, which needs no display:
+# no OpenCV window is opened and OS input goes to the "null" backend instead of pyautogui.
+STREAM_PORT = None
+SHOW_WINDOW = True
 
 # Button configuration for radial menu
 BUTTONS = [
@@ -198,74 +224,175 @@ def handle_submenus(frame, cursor_position, click_flag, actions):
         open_settings_menu(frame, cursor_position, click_flag, set_current_menu, actions)
 
 
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
-    print("Error: Could not open webcam.")
-    exit()
-
-print("Press 'q' to exit.")
-
-base_options = BaseOptions(model_asset_path='hand_landmarker.task')
-options = vision.HandLandmarkerOptions(
-    base_options=base_options,
-    num_hands=2
-)
-
-dragging = False
-avg_y_previous = None
-
-with vision.HandLandmarker.create_from_options(options) as detector:
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            print("Failed to grab frame.")
-            break
-        frame = cv2.flip(frame, 1)
-
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
-
-        detection_result = detector.detect(mp_image)
-
-        right_hand = None
-        left_hand = None
-
-        if detection_result.hand_landmarks:
-            for idx, hand_landmarks in enumerate(detection_result.hand_landmarks):
-                handedness = detection_result.handedness[idx][0].category_name
-                corrected_handedness = "Right" if handedness == "Left" else "Left"
-
-                if corrected_handedness == "Right":
-                    right_hand = hand_landmarks
-                elif corrected_handedness == "Left":
-                    left_hand = hand_landmarks
-
-        controlling_hand = right_hand or left_hand
-        controlling_handedness = "Right" if right_hand else "Left"
-
-        finger_states = []
-        if controlling_hand:
-            finger_states = get_finger_states(controlling_hand, controlling_handedness)
-
-        actions = perform_gesture_actions(controlling_hand, controlling_handedness, finger_states, frame.shape[1], frame.shape[0])
-
-        cursor_position = pyautogui.position()
-        click_flag = actions.get("click", False)
-
-        annotated_image = draw_landmarks_on_image(rgb_frame, detection_result)
-
-        if current_menu is not None:
-            handle_submenus(annotated_image, cursor_position, click_flag, actions)
-        else:
-            draw_menu_button(annotated_image, cursor_position, click_flag)
-            draw_circular_selector(annotated_image, cursor_position, click_flag)
+def create_detector(quality_settings):
+    base_options = BaseOptions(model_asset_path=resolve_model_path(quality_settings["model_asset_path"]))
+    options = vision.HandLandmarkerOptions(
+        base_options=base_options,
+        num_hands=quality_settings["num_hands"]
+    )
+    return vision.HandLandmarker.create_from_options(options)
 
-        cv2.imshow('Annotated Frame', cv2.cvtColor(annotated_image, cv2.COLOR_RGB2BGR))
 
-        if cv2.waitKey(1) & 0xFF == ord('q') or screen_exit:
-            print("Exiting program...")
-            break
+def main():
+    cap = cv2.VideoCapture(0)
+    if not cap.isOpened():
+        print("Error: Could not open webcam.")
+        return
 
-cap.release()
-cv2.destroyAllWindows()
-print("Program terminated successfully.")
\ No newline at end of file
+    if SHOW_WINDOW:
+        print("Press 'q' to exit.")
+    else:
+        # pyautogui cannot even be imported without a display
+        set_input_injector(create_injector("null", synchronous=True))
+        print("Press Ctrl-C to exit.")
+
+    dragging = False
+    avg_y_previous = None
+
+    # One motion model per hand so the two hands never mix
+    predictors = {"Right": LandmarkPredictor(), "Left": LandmarkPredictor()}
+    last_inference_time = None
+
+    quality = QualityController(FRAME_TIME_BUDGET)
+    quality_settings = quality.settings()
+    detector = create_detector(quality_settings)
+
+    recorder = None
+    streamer = None
+    try:
+        # Created inside the try so a failure here (e.g. the stream port is taken)
+        # still closes the detector and anything already opened
+        if RECORDING_DIR is not None:
+            recording_path = os.path.join(RECORDING_DIR, time.strftime("session-%Y%m%d-%H%M%S"))
+            recorder = LandmarkRecorder(recording_path, metadata={
+                "frame_width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                "frame_height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            })
+            print(f"Recording landmarks to {recording_path}")
+
+        if STREAM_PORT is not None:
+            streamer = MJPEGStreamer(port=STREAM_PORT)
+            streamer.start()
+
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                print("Failed to grab frame.")
+                break
+            frame = cv2.flip(frame, 1)
+            now = time.perf_counter()
+
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+            run_inference = last_inference_time is None or now - last_inference_time >= 1.0 / INFERENCE_FPS
+
+            right_hand = None
+            left_hand = None
+            detected_hands = None  # Raw detector output, kept for the recording
+            handedness_scores = [0.0, 0.0]
+
+            if run_inference:
+                inference_frame = rgb_frame
+                if quality_settings["input_scale"] != 1.0:
+                    inference_frame = cv2.resize(rgb_frame, None, fx=quality_settings["input_scale"],
+                                                 fy=quality_settings["input_scale"], interpolation=cv2.INTER_AREA)
+                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=inference_frame)
+                detection_result = detector.detect(mp_image)
+                last_inference_time = now
+
+                if detection_result.hand_landmarks:
+                    for idx, hand_landmarks in enumerate(detection_result.hand_landmarks):
+                        handedness = detection_result.handedness[idx][0].category_name
+                        corrected_handedness = "Right" if handedness == "Left" else "Left"
+
+                        if corrected_handedness == "Right":
+                            right_hand = hand_landmarks
+                            handedness_scores[0] = detection_result.handedness[idx][0].score
+                        elif corrected_handedness == "Left":
+                            left_hand = hand_landmarks
+                            handedness_scores[1] = detection_result.handedness[idx][0].score
+                detected_hands = (right_hand, left_hand)
+
+                # Use the filtered estimate on detection frames too, so the cursor does not
+                # jump between raw detections and the extrapolated frames in between
+                if right_hand:
+                    right_hand = predictors["Right"].update(right_hand, now)
+                else:
+                    predictors["Right"].reset()
+                if left_hand:
+                    left_hand = predictors["Left"].update(left_hand, now)
+                else:
+                    predictors["Left"].reset()
+            else:
+                right_hand = predictors["Right"].predict(now)
+                left_hand = predictors["Left"].predict(now)
+
+            controlling_hand = right_hand or left_hand
+            controlling_handedness = "Right" if right_hand else "Left"
+
+            finger_states = []
+            if controlling_hand:
+                finger_states = get_finger_states(controlling_hand, controlling_handedness)
+
+            actions = perform_gesture_actions(controlling_hand, controlling_handedness, finger_states, frame.shape[1], frame.shape[0],
+                                              predicted=not run_inference)
+
+            if recorder is not None:
+                recorder.record(now, (right_hand, left_hand), finger_states, actions,
+                                detected_hands=detected_hands, handedness_scores=handedness_scores)
+
+            cursor_position = get_input_injector().position()
+            click_flag = actions.get("click", False)
+
+            # Draw the hands that drove the cursor this frame, not the last raw detection
+            drawn_hands = [(hand, label) for hand, label in ((right_hand, "Right"), (left_hand, "Left")) if hand]
+            annotated_image = draw_hands_on_image(rgb_frame, drawn_hands, quality_settings["annotation_level"])
+
+            if current_menu is not None:
+                handle_submenus(annotated_image, cursor_position, click_flag, actions)
+            else:
+                draw_menu_button(annotated_image, cursor_position, click_flag)
+                draw_circular_selector(annotated_image, cursor_position, click_flag)
+
+            display_frame = cv2.cvtColor(annotated_image, cv2.COLOR_RGB2BGR)
+            if SHOW_WINDOW:
+                cv2.imshow('Annotated Frame', display_frame)
+            if streamer is not None:
+                # Only hands the frame over; encoding happens on the streamer's thread
+                streamer.publish(display_frame)
+
+            if quality.record(time.perf_counter() - now):
+                new_settings = quality.settings()
+                # Hand count and model are fixed at creation, so those need a new detector
+                if (new_settings["num_hands"] != quality_settings["num_hands"] or
+                        new_settings["model_asset_path"] != quality_settings["model_asset_path"]):
+                    detector.close()
+                    detector = create_detector(new_settings)
+                quality_settings = new_settings
+
+            key_pressed = cv2.waitKey(1) & 0xFF if SHOW_WINDOW else None
+            if key_pressed == ord('q') or screen_exit:
+                print("Exiting program...")
+                break
+    except KeyboardInterrupt:
+        print("Exiting program...")
+    finally:
+        detector.close()
+        if recorder is not None:
+            recorder.close()
+        if streamer is not None:
+            streamer.stop()
+        cap.release()
+        if SHOW_WINDOW:
+            cv2.destroyAllWindows()
+        get_input_injector().close()
+
+    for hand_label, predictor in predictors.items():
+        error = predictor.mean_error()
+        if error is not None:
+            print(f"{hand_label} hand mean prediction error: {error:.4f} over {predictor.error_count} detections")
+    print("Program terminated successfully.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import threading
+from collections import deque
+
+
+class InputBackend:
+    """
+    Interface for anything that can inject OS input events.
+    To add a backend (e.g. uinput on the TV units), subclass this and register it in BACKENDS.
+    """
+
+    # Exceptions that mean input injection must stop for good (e.g. an emergency stop)
+    # rather than a transient failure of one event
+    fatal_errors = ()
+
+    def move_to(self, x, y):
+        raise NotImplementedError
+
+    def click(self):
+        raise NotImplementedError
+
+    def scroll(self, amount):
+        raise NotImplementedError
+
+    def position(self):
+        raise NotImplementedError
+
+
+class PyAutoGUIBackend(InputBackend):
+    def __init__(self):
+        import pyautogui  # Imported here so the other backends work without a display
+
+        # pyautogui sleeps after every call by default; the worker thread already paces events
+        pyautogui.PAUSE = 0
+        self.pyautogui = pyautogui
+        # Moving the mouse into a screen corner is pyautogui's emergency stop
+        self.fatal_errors = (pyautogui.FailSafeException,)
+
+    def move_to(self, x, y):
+        self.pyautogui.moveTo(x, y)
+
+    def click(self):
+        self.pyautogui.click()
+
+    def scroll(self, amount):
+        self.pyautogui.scroll(amount)
+
+    def position(self):
+        return tuple(self.pyautogui.position())
+
+
+class NullBackend(InputBackend):
+    """
+    Drops every event. Used by benchmarks to measure the gesture code without moving the real cursor.
+    """
+
+    def __init__(self):
+        self.cursor = (0, 0)
+
+    def move_to(self, x, y):
+        self.cursor = (x, y)
+
+    def click(self):
+        pass
+
+    def scroll(self, amount):
+        pass
+
+    def position(self):
+        return self.cursor
+
+
+class RecordingBackend(InputBackend):
+    """
+    Does not touch the OS, only records the events it receives. Used by tests and replays.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.cursor = (0, 0)
+
+    def move_to(self, x, y):
+        self.cursor = (x, y)
+        self.events.append(("move", x, y))
+
+    def click(self):
+        self.events.append(("click",))
+
+    def scroll(self, amount):
+        self.events.append(("scroll", amount))
+
+    def position(self):
+        return self.cursor
+
+
+BACKENDS = {
+    "pyautogui": PyAutoGUIBackend,
+    "null": NullBackend,
+    "recording": RecordingBackend,
+}
+
+
+class InputInjector:
+    """
+    Sends input events to a backend from a dedicated worker thread.
+
+    Consecutive cursor moves are coalesced so only the latest position is sent,
+    clicks and scrolls are delivered in order, and the calling (frame) thread never waits.
+    If the backend raises one of its fatal_errors, the worker stops and the error is
+    re-raised on the calling thread by the next move_to/click/scroll.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.queue = deque()
+        self.condition = threading.Condition()
+        self.last_requested = None  # Latest cursor position asked for, even if not sent yet
+        self.busy = False
+        self.running = True
+        self.fatal_error = None
+        self.worker = threading.Thread(target=self._run, name="input-injector", daemon=True)
+        self.worker.start()
+
+    def move_to(self, x, y):
+        self._raise_if_failed()
+        with self.condition:
+            self.last_requested = (x, y)
+            # Replace a move that is still waiting instead of queueing another one
+            if self.queue and self.queue[-1][0] == "move":
+                self.queue[-1] = ("move", x, y)
+            else:
+                self.queue.append(("move", x, y))
+            self.condition.notify_all()
+
+    def click(self):
+        self._put(("click",))
+
+    def scroll(self, amount):
+        self._put(("scroll", amount))
+
+    def _put(self, event):
+        self._raise_if_failed()
+        with self.condition:
+            self.queue.append(event)
+            self.condition.notify_all()
+
+    def _raise_if_failed(self):
+        if self.fatal_error is not None:
+            raise self.fatal_error
+
+    def position(self):
+        """
+        Cursor position as the frame loop sees it: the latest requested move if there
+        is one, so hover feedback does not lag behind events still being injected.
+        """
+        with self.condition:
+            if self.last_requested is not None:
+                return self.last_requested
+        return self.backend.position()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.queue:
+                    self.condition.wait()
+                if not self.queue:
+                    return
+                event = self.queue.popleft()
+                self.busy = True
+
+            try:
+                if event[0] == "move":
+                    self.backend.move_to(event[1], event[2])
+                elif event[0] == "click":
+                    self.backend.click()
+                elif event[0] == "scroll":
+                    self.backend.scroll(event[1])
+            except self.backend.fatal_errors as e:
+                with self.condition:
+                    self.fatal_error = e
+                    self.running = False
+                    self.queue.clear()
+                    self.busy = False
+                    self.condition.notify_all()
+                return
+            except Exception as e:
+                print(f"Input injection failed for {event[0]}: {e}")
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Block until every queued event has been sent. Only meant for shutdown and tests.
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.queue and not self.busy, timeout)
+
+    def close(self):
+        """
+        Send the remaining events and stop the worker thread.
+        """
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.worker.join()
+
+
+class SynchronousInjector:
+    """
+    Same interface as InputInjector, but calls the backend inline on the caller's thread
+    with no coalescing. Used where results must not depend on thread timing
+    (offline replays) or where only the caller's own cost should be measured (benchmarks).
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def move_to(self, x, y):
+        self.backend.move_to(x, y)
+
+    def click(self):
+        self.backend.click()
+
+    def scroll(self, amount):
+        self.backend.scroll(amount)
+
+    def position(self):
+        return self.backend.position()
+
+    def flush(self, timeout=None):
+        return True
+
+    def close(self):
+        pass
+
+
+def create_injector(name="pyautogui", synchronous=False):
+    if synchronous:
+        return SynchronousInjector(BACKENDS[name]())
+    return InputInjector(BACKENDS[name]())
@@ -0,0 +1,135 @@
+import os
+
+DEFAULT_MODEL_ASSET = 'hand_landmarker.task'
+
+# Quality levels from best to cheapest. Each step down trades a little accuracy for frame time.
+# annotation_level: 0 = no overlay, 1 = hand skeleton only, 2 = skeleton, handedness and finger labels
+QUALITY_LEVELS = [
+    {"num_hands": 2, "input_scale": 1.0, "model_asset_path": DEFAULT_MODEL_ASSET, "annotation_level": 2},
+    {"num_hands": 2, "input_scale": 0.75, "model_asset_path": DEFAULT_MODEL_ASSET, "annotation_level": 2},
+    {"num_hands": 1, "input_scale": 0.75, "model_asset_path": DEFAULT_MODEL_ASSET, "annotation_level": 1},
+    {"num_hands": 1, "input_scale": 0.5, "model_asset_path": 'hand_landmarker_lite.task', "annotation_level": 1},
+    {"num_hands": 1, "input_scale": 0.5, "model_asset_path": 'hand_landmarker_lite.task', "annotation_level": 0},
+]
+
+
+_reported_missing_models = set()
+
+
+def resolve_model_path(model_asset_path):
+    """
+    Fall back to the default model when a lighter .task file is not deployed on this device.
+    """
+    if model_asset_path == DEFAULT_MODEL_ASSET or os.path.exists(model_asset_path):
+        return model_asset_path
+    if model_asset_path not in _reported_missing_models:
+        _reported_missing_models.add(model_asset_path)
+        print(f"Model {model_asset_path} not found, using {DEFAULT_MODEL_ASSET} instead")
+    return DEFAULT_MODEL_ASSET
+
+
+class QualityController:
+    """
+    Moves between QUALITY_LEVELS so the smoothed frame time stays within a budget.
+
+    Hysteresis: the level only drops after the frame time has been over budget for
+    degrade_frames frames in a row, only rises after it has been well under budget
+    (upgrade_ratio) for the longer upgrade_frames, and nothing changes for
+    cooldown_frames after an adjustment while the new settings take effect.
+
+    When a level has to be left, its frame time is remembered together with the
+    frame time of the level below once that settles. Going back up is only tried
+    when that measurement, scaled by how much faster the current level has become
+    since, would fit the budget. So a level the device cannot sustain is not retried
+    over and over (recreating the detector each time), but is once the load drops.
+    """
+
+    def __init__(self, frame_time_budget, levels=QUALITY_LEVELS, start_level=0, smoothing=0.1,
+                 upgrade_ratio=0.7, degrade_frames=30, upgrade_frames=120, cooldown_frames=60):
+        self.frame_time_budget = frame_time_budget  # Seconds per frame
+        # Resolve model files up front so levels report (and compare by) the model actually used
+        self.levels = [dict(level, model_asset_path=resolve_model_path(level["model_asset_path"]))
+                       for level in levels]
+        self.level = start_level
+        self.smoothing = smoothing
+        self.upgrade_ratio = upgrade_ratio
+        self.degrade_frames = degrade_frames
+        self.upgrade_frames = upgrade_frames
+        self.cooldown_frames = cooldown_frames
+
+        # Per level: smoothed frame time when it was last abandoned as over budget, and
+        # the frame time of the level below once it settled after that
+        self.failed_frame_times = [None] * len(self.levels)
+        self.reference_frame_times = [None] * len(self.levels)
+
+        self.average_frame_time = None
+        self.over_budget_count = 0
+        self.under_budget_count = 0
+        self.cooldown = 0
+
+    def settings(self):
+        return self.levels[self.level]
+
+    def record(self, frame_time):
+        """
+        Feed one measured frame time in seconds. Returns True if the quality level changed.
+        """
+        if self.average_frame_time is None:
+            self.average_frame_time = frame_time
+        else:
+            self.average_frame_time += self.smoothing * (frame_time - self.average_frame_time)
+
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return False
+
+        if self.level > 0 and self.failed_frame_times[self.level - 1] is not None \
+                and self.reference_frame_times[self.level - 1] is None:
+            self.reference_frame_times[self.level - 1] = self.average_frame_time
+
+        if self.average_frame_time > self.frame_time_budget:
+            self.over_budget_count += 1
+            self.under_budget_count = 0
+        elif self.average_frame_time < self.frame_time_budget * self.upgrade_ratio:
+            self.under_budget_count += 1
+            self.over_budget_count = 0
+        else:
+            self.over_budget_count = 0
+            self.under_budget_count = 0
+
+        if self.over_budget_count >= self.degrade_frames and self.level < len(self.levels) - 1:
+            self._set_level(self.level + 1)
+            return True
+        if self.under_budget_count >= self.upgrade_frames and self.level > 0 \
+                and self._upgrade_fits(self.level - 1):
+            self._set_level(self.level - 1)
+            return True
+        return False
+
+    def _upgrade_fits(self, level):
+        """
+        Whether the given (better) level is expected to fit the budget at the current load.
+        """
+        failed = self.failed_frame_times[level]
+        reference = self.reference_frame_times[level]
+        if failed is None or reference is None:
+            return True
+        return failed * self.average_frame_time / reference <= self.frame_time_budget
+
+    def _set_level(self, level):
+        if level > self.level:
+            # Leaving an over-budget level: remember how slow it was
+            self.failed_frame_times[self.level] = self.average_frame_time
+            self.reference_frame_times[self.level] = None
+        else:
+            self.failed_frame_times[level] = None
+            self.reference_frame_times[level] = None
+
+        direction = "Lowering" if level > self.level else "Raising"
+        print(f"{direction} quality level {self.level} -> {level} "
+              f"(frame time {self.average_frame_time * 1000:.1f} ms, "
+              f"budget {self.frame_time_budget * 1000:.1f} ms): {self.levels[level]}")
+        self.level = level
+        self.over_budget_count = 0
+        self.under_budget_count = 0
+        self.cooldown = self.cooldown_frames
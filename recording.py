@@ -0,0 +1,240 @@
+"""
+Compact columnar recording of what the recognizer saw, frame by frame.
+
+A recording is a directory holding one raw binary file per column plus index.json,
+which lists the frame count and every column's dtype and per-frame shape:
+
+    detected_landmarks  float16 (2, 21, 3)  raw detector output (x, y, z) for the Right and Left hand slots
+    detected_present    uint8   (2,)        1 if the detector found the hand in that slot
+    handedness_scores   float16 (2,)        detector handedness confidence per slot
+    tracked_landmarks   float16 (2, 21, 3)  filtered/predicted pose the gesture logic actually used
+    tracked_present     uint8   (2,)        1 if a tracked hand was in that slot
+    finger_states       uint8   (5,)        Thumb, Index, Middle, Ring, Pinky open flags of the controlling hand
+    flags               uint8   ()          bitmask of FLAG_BITS (actions taken, predicted frame)
+    timestamps          float64 ()          seconds since the first recorded frame
+
+The detected_* columns are only filled on frames where inference ran (the "predicted"
+flag is clear), so recordings can be used to re-tune the motion model and inference
+rate offline; the tracked_* columns reproduce what drove the cursor.
+
+float64 is kept for timestamps because float16/float32 lose millisecond resolution
+over multi-hour sessions. Readers open the columns with numpy.memmap, so any frame
+range can be accessed without loading the whole file.
+"""
+import contextlib
+import io
+import json
+import os
+import time
+
+import numpy as np
+
+import detect
+from detect import get_finger_states, perform_gesture_actions
+from injection import RecordingBackend, SynchronousInjector
+from tracking import array_to_landmarks
+
+FORMAT_VERSION = 2
+HAND_SLOTS = ["Right", "Left"]
+FLAG_BITS = {"click": 0, "scroll-up": 1, "scroll-down": 2, "predicted": 3}
+
+COLUMNS = {
+    "detected_landmarks": ("float16", (2, 21, 3)),
+    "detected_present": ("uint8", (2,)),
+    "handedness_scores": ("float16", (2,)),
+    "tracked_landmarks": ("float16", (2, 21, 3)),
+    "tracked_present": ("uint8", (2,)),
+    "finger_states": ("uint8", (5,)),
+    "flags": ("uint8", ()),
+    "timestamps": ("float64", ()),
+}
+
+
+class LandmarkRecorder:
+    """
+    Appends frames to a recording. Frames are buffered in preallocated arrays and
+    written one chunk at a time, so record() is only a few array assignments.
+    """
+
+    def __init__(self, path, chunk_frames=256, metadata=None):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.chunk_frames = chunk_frames
+        self.metadata = dict(metadata or {}, started_at=time.time())
+
+        self.buffers = {
+            name: np.zeros((chunk_frames,) + shape, dtype=dtype)
+            for name, (dtype, shape) in COLUMNS.items()
+        }
+        self.files = {name: open(os.path.join(path, name + ".bin"), "wb") for name in COLUMNS}
+        self.frames = 0     # Frames already written to disk
+        self.buffered = 0   # Frames waiting in the buffers
+        self.first_timestamp = None
+        self._write_index()
+
+    def record(self, timestamp, tracked_hands, finger_states, actions, detected_hands=None,
+               handedness_scores=(0.0, 0.0)):
+        """
+        Buffer one frame. tracked_hands is the (right, left) pair that drove the gesture
+        logic, detected_hands the raw detector output on inference frames or None on
+        predicted frames; each hand is a list of 21 landmarks or None. actions is the
+        dict returned by perform_gesture_actions.
+        """
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        i = self.buffered
+        predicted = detected_hands is None
+
+        self._store_hands(i, "tracked", tracked_hands)
+        self._store_hands(i, "detected", (None, None) if predicted else detected_hands)
+        self.buffers["handedness_scores"][i] = (0.0, 0.0) if predicted else handedness_scores
+
+        if finger_states:
+            self.buffers["finger_states"][i] = finger_states
+        else:
+            self.buffers["finger_states"][i] = 0
+
+        flags = 0
+        for name, bit in FLAG_BITS.items():
+            if actions.get(name):
+                flags |= 1 << bit
+        if predicted:
+            flags |= 1 << FLAG_BITS["predicted"]
+        self.buffers["flags"][i] = flags
+        self.buffers["timestamps"][i] = timestamp - self.first_timestamp
+
+        self.buffered += 1
+        if self.buffered == self.chunk_frames:
+            self.flush()
+
+    def _store_hands(self, i, prefix, hands):
+        for slot, hand in enumerate(hands):
+            if hand:
+                self.buffers[prefix + "_landmarks"][i, slot] = [(lm.x, lm.y, lm.z) for lm in hand]
+                self.buffers[prefix + "_present"][i, slot] = 1
+            else:
+                self.buffers[prefix + "_landmarks"][i, slot] = 0
+                self.buffers[prefix + "_present"][i, slot] = 0
+
+    def flush(self):
+        """
+        Append the buffered frames to the column files and update the index.
+        """
+        if self.buffered == 0:
+            return
+        for name, f in self.files.items():
+            self.buffers[name][:self.buffered].tofile(f)
+            f.flush()
+        self.frames += self.buffered
+        self.buffered = 0
+        self._write_index()
+
+    def _write_index(self):
+        index = {
+            "version": FORMAT_VERSION,
+            "frames": self.frames,
+            "hand_slots": HAND_SLOTS,
+            "flag_bits": FLAG_BITS,
+            "columns": {name: {"dtype": dtype, "shape": list(shape)} for name, (dtype, shape) in COLUMNS.items()},
+            "metadata": self.metadata,
+        }
+        # Write then rename so a crash never leaves a half-written index behind
+        tmp_path = os.path.join(self.path, "index.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.path, "index.json"))
+
+    def close(self):
+        self.flush()
+        for f in self.files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class LandmarkRecording:
+    """
+    Read-only, memory-mapped view of a recording. Columns are numpy arrays indexed by frame.
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, "index.json")) as f:
+            index = json.load(f)
+        if index["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording version {index['version']} in {path}")
+
+        self.path = path
+        self.frames = index["frames"]
+        self.metadata = index["metadata"]
+        self.flag_bits = index["flag_bits"]
+
+        self.columns = {}
+        for name, column in index["columns"].items():
+            shape = (self.frames,) + tuple(column["shape"])
+            if self.frames == 0:
+                # numpy.memmap cannot map an empty file
+                self.columns[name] = np.zeros(shape, dtype=column["dtype"])
+            else:
+                self.columns[name] = np.memmap(os.path.join(path, name + ".bin"), dtype=column["dtype"],
+                                               mode="r", shape=shape)
+
+    def __len__(self):
+        return self.frames
+
+    def hands(self, i, source="tracked"):
+        """
+        Return (right_hand, left_hand) for frame i as lists of Landmark, or None if absent.
+        source is "tracked" (what drove the cursor) or "detected" (raw detector output,
+        only present on frames where inference ran).
+        """
+        present = self.columns[source + "_present"][i]
+        landmarks = self.columns[source + "_landmarks"][i].astype(np.float64)
+        return tuple(array_to_landmarks(landmarks[slot]) if present[slot] else None for slot in range(2))
+
+    def flag(self, i, name):
+        return bool(self.columns["flags"][i] >> self.flag_bits[name] & 1)
+
+
+def replay(recording, injector=None, frame_width=None, frame_height=None, start=0, stop=None, quiet=True,
+           source="tracked"):
+    """
+    Run get_finger_states and perform_gesture_actions over recorded frames, yielding
+    (frame index, finger states, actions) for each. Cursor moves and clicks go to
+    injector, never to the OS. The default sends every event inline to a RecordingBackend,
+    so the same recording always replays to the same events. source selects the
+    tracked or the raw detected hands (see LandmarkRecording.hands).
+    """
+    frame_width = frame_width or recording.metadata.get("frame_width", 1280)
+    frame_height = frame_height or recording.metadata.get("frame_height", 720)
+    stop = len(recording) if stop is None else min(stop, len(recording))
+
+    owns_injector = injector is None
+    if owns_injector:
+        injector = SynchronousInjector(RecordingBackend())
+    previous_injector = detect.input_injector
+    detect.set_input_injector(injector)
+
+    # perform_gesture_actions prints on every click and scroll, which dominates long replays
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    try:
+        for i in range(start, stop):
+            right_hand, left_hand = recording.hands(i, source)
+            controlling_hand = right_hand or left_hand
+            controlling_handedness = "Right" if right_hand else "Left"
+
+            finger_states = []
+            if controlling_hand:
+                finger_states = get_finger_states(controlling_hand, controlling_handedness)
+
+            with output:
+                actions = perform_gesture_actions(controlling_hand, controlling_handedness, finger_states,
+                                                  frame_width, frame_height, predicted=recording.flag(i, "predicted"))
+            yield i, finger_states, actions
+    finally:
+        detect.set_input_injector(previous_injector)
+        if owns_injector:
+            injector.close()
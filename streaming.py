@@ -0,0 +1,201 @@
+import select
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+
+BOUNDARY = "frame"
+
+# JPEG quality and frame rate for a single viewer; each extra viewer lowers both
+# so encoding and upload bandwidth stay roughly constant on the TV unit.
+MAX_QUALITY, MIN_QUALITY, QUALITY_STEP = 85, 50, 10
+MAX_FPS, MIN_FPS, FPS_STEP = 20, 5, 5
+
+INDEX_PAGE = b"""<!DOCTYPE html>
+<html><head><title>Annotated Frame</title></head>
+<body style="margin:0;background:#000"><img src="/stream" style="width:100%"></body></html>
+"""
+
+
+def stream_settings(clients):
+    """
+    JPEG quality and frames per second to use for the given number of connected clients.
+    """
+    extra = max(clients - 1, 0)
+    quality = max(MAX_QUALITY - extra * QUALITY_STEP, MIN_QUALITY)
+    fps = max(MAX_FPS - extra * FPS_STEP, MIN_FPS)
+    return quality, fps
+
+
+class MJPEGStreamer:
+    """
+    Serves the latest annotated frame as an MJPEG stream over HTTP (http://host:port/).
+
+    publish() only stores a reference to the frame. A worker thread encodes the most
+    recent one, skipping frames it cannot keep up with, and nothing is encoded while
+    no client is connected, so streaming never slows down the gesture loop.
+    """
+
+    def __init__(self, host="0.0.0.0", port=8080):
+        self.host = host
+        self.port = port
+        self.condition = threading.Condition()
+        self.clients = 0
+        self.latest_frame = None   # Newest published BGR frame, not yet encoded
+        self.jpeg = None           # Newest encoded frame
+        self.sequence = 0          # Increments with every encoded frame
+        self.running = False
+        self.server = None
+        self.server_thread = None
+        self.encoder_thread = None
+
+    def start(self):
+        # Each streamer gets its own handler class so the handler can reach it
+        handler = type("Handler", (StreamHandler,), {"streamer": self})
+        self.server = ThreadingHTTPServer((self.host, self.port), handler)
+        self.server.daemon_threads = True
+        self.running = True
+        self.server_thread = threading.Thread(target=self.server.serve_forever, name="mjpeg-server", daemon=True)
+        self.encoder_thread = threading.Thread(target=self._encode_loop, name="mjpeg-encoder", daemon=True)
+        self.server_thread.start()
+        self.encoder_thread.start()
+        print(f"Streaming annotated frames on http://{self.host}:{self.port}/")
+
+    def publish(self, frame):
+        """
+        Offer a BGR frame for streaming. The frame must not be modified afterwards.
+        """
+        if self.clients == 0:
+            return
+        with self.condition:
+            self.latest_frame = frame
+            self.condition.notify_all()
+
+    def _encode_loop(self):
+        last_encode = 0.0
+        while True:
+            with self.condition:
+                self.condition.wait_for(
+                    lambda: not self.running or (self.clients > 0 and self.latest_frame is not None))
+                if not self.running:
+                    return
+                quality, fps = stream_settings(self.clients)
+
+            # Pace to the target frame rate, then take whatever frame is newest by then
+            delay = last_encode + 1.0 / fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            with self.condition:
+                frame = self.latest_frame
+                self.latest_frame = None
+            if frame is None:
+                continue
+
+            last_encode = time.perf_counter()
+            ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if not ok:
+                continue
+
+            with self.condition:
+                if self.clients == 0:
+                    continue  # Everyone left while encoding; don't keep the frame for the next viewer
+                self.jpeg = encoded.tobytes()
+                self.sequence += 1
+                self.condition.notify_all()
+
+    def wait_for_jpeg(self, last_sequence, timeout=1.0):
+        """
+        Block until a frame newer than last_sequence is encoded. Returns (sequence, jpeg),
+        or (last_sequence, None) on timeout or shutdown.
+        """
+        with self.condition:
+            self.condition.wait_for(
+                lambda: not self.running or (self.sequence > last_sequence and self.jpeg is not None), timeout)
+            if not self.running or self.sequence <= last_sequence or self.jpeg is None:
+                return last_sequence, None
+            return self.sequence, self.jpeg
+
+    def add_client(self):
+        with self.condition:
+            self.clients += 1
+            print(f"Stream client connected ({self.clients} watching)")
+            self.condition.notify_all()
+
+    def remove_client(self):
+        with self.condition:
+            self.clients -= 1
+            if self.clients == 0:
+                # Drop the pending and last encoded frames so the next viewer never sees a stale image
+                self.latest_frame = None
+                self.jpeg = None
+            print(f"Stream client disconnected ({self.clients} watching)")
+
+    def stop(self):
+        if not self.running:
+            return
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.server.shutdown()
+        self.server.server_close()
+        self.encoder_thread.join()
+
+
+class StreamHandler(BaseHTTPRequestHandler):
+    streamer = None  # Set by MJPEGStreamer.start()
+
+    def do_GET(self):
+        if self.path == "/":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(INDEX_PAGE)))
+            self.end_headers()
+            self.wfile.write(INDEX_PAGE)
+        elif self.path == "/stream":
+            self._stream()
+        else:
+            self.send_error(404)
+
+    def _stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        streamer = self.streamer
+        streamer.add_client()
+        sequence = 0
+        try:
+            while streamer.running:
+                sequence, jpeg = streamer.wait_for_jpeg(sequence)
+                if jpeg is None:
+                    # Nothing new to send, so a write would not reveal a closed connection
+                    if self._client_gone():
+                        break
+                    continue
+                self.wfile.write(
+                    f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode())
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            streamer.remove_client()
+
+    def _client_gone(self):
+        """
+        True if the viewer closed the connection (the socket reads as end-of-file).
+        """
+        readable, _, _ = select.select([self.connection], [], [], 0)
+        if not readable:
+            return False
+        try:
+            return self.connection.recv(1, socket.MSG_PEEK) == b""
+        except OSError:
+            return True
+
+    def log_message(self, format, *args):
+        pass  # Keep the console for gesture output
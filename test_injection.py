@@ -0,0 +1,113 @@
+import threading
+
+import pytest
+
+from injection import InputInjector, RecordingBackend, SynchronousInjector
+
+
+class BlockingBackend(RecordingBackend):
+    """
+    Holds the worker inside the first move until released, so the test controls
+    exactly which events are queued behind it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def move_to(self, x, y):
+        if not self.started.is_set():
+            self.started.set()
+            self.release.wait(5)
+        super().move_to(x, y)
+
+
+def test_moves_are_coalesced_and_discrete_events_keep_their_order():
+    backend = BlockingBackend()
+    injector = InputInjector(backend)
+    injector.move_to(1, 1)
+    assert backend.started.wait(5)
+
+    injector.move_to(2, 2)
+    injector.move_to(3, 3)
+    injector.click()
+    injector.move_to(4, 4)
+    injector.move_to(5, 5)
+    injector.scroll(-1)
+    injector.move_to(6, 6)
+    assert injector.position() == (6, 6)
+
+    backend.release.set()
+    injector.close()
+
+    assert backend.events == [
+        ("move", 1, 1),
+        ("move", 3, 3),
+        ("click",),
+        ("move", 5, 5),
+        ("scroll", -1),
+        ("move", 6, 6),
+    ]
+
+
+def test_close_sends_remaining_events():
+    backend = RecordingBackend()
+    injector = InputInjector(backend)
+    injector.click()
+    injector.click()
+    injector.close()
+
+    assert backend.events == [("click",), ("click",)]
+    assert not injector.worker.is_alive()
+
+
+def test_synchronous_injector_sends_every_event_inline():
+    backend = RecordingBackend()
+    injector = SynchronousInjector(backend)
+    injector.move_to(1, 1)
+    injector.move_to(2, 2)
+    injector.click()
+
+    assert backend.events == [("move", 1, 1), ("move", 2, 2), ("click",)]
+    assert injector.position() == (2, 2)
+
+
+class FailSafeError(Exception):
+    pass
+
+
+class FailSafeBackend(RecordingBackend):
+    fatal_errors = (FailSafeError,)
+
+    def click(self):
+        raise FailSafeError("cursor in a screen corner")
+
+
+def test_fatal_backend_error_stops_the_worker_and_reaches_the_caller():
+    backend = FailSafeBackend()
+    injector = InputInjector(backend)
+    injector.click()
+    injector.worker.join(5)
+
+    assert not injector.worker.is_alive()
+    with pytest.raises(FailSafeError):
+        injector.move_to(1, 1)
+    with pytest.raises(FailSafeError):
+        injector.click()
+    injector.close()
+
+
+def test_transient_backend_error_is_reported_and_injection_continues(capsys):
+    class FlakyBackend(RecordingBackend):
+        def click(self):
+            raise OSError("display busy")
+
+    backend = FlakyBackend()
+    injector = InputInjector(backend)
+    injector.click()
+    injector.move_to(2, 2)
+    injector.close()
+
+    assert backend.events == [("move", 2, 2)]
+    assert "Input injection failed for click" in capsys.readouterr().out
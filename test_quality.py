@@ -0,0 +1,52 @@
+from quality import QualityController
+
+BUDGET = 1.0 / 30
+
+
+def run(controller, frame_time_for_level, frames):
+    """
+    Feed the controller frames whose cost depends on its current level.
+    Returns the (frame, new level) of every change.
+    """
+    changes = []
+    for i in range(frames):
+        if controller.record(frame_time_for_level(controller.level, i)):
+            changes.append((i, controller.level))
+    return changes
+
+
+def test_steady_over_budget_lowers_quality_one_level_at_a_time():
+    controller = QualityController(BUDGET)
+    changes = run(controller, lambda level, i: 0.05, 2000)
+
+    assert [level for _, level in changes] == [1, 2, 3, 4]
+    assert controller.level == len(controller.levels) - 1
+    # Cooldown plus the degrade window between consecutive changes
+    gaps = [b - a for (a, _), (b, _) in zip(changes, changes[1:])]
+    assert all(gap >= controller.cooldown_frames + controller.degrade_frames for gap in gaps)
+
+
+def test_steady_under_budget_raises_quality_back_to_the_best_level():
+    controller = QualityController(BUDGET, start_level=4)
+    changes = run(controller, lambda level, i: 0.01, 2000)
+
+    assert [level for _, level in changes] == [3, 2, 1, 0]
+    assert controller.level == 0
+
+
+def test_budget_between_two_levels_settles_instead_of_oscillating():
+    # Level 1 is too slow for the budget, level 2 comfortably under it
+    controller = QualityController(BUDGET, start_level=1)
+    changes = run(controller, lambda level, i: 0.05 if level < 2 else 0.02, 2000)
+
+    assert [level for _, level in changes] == [2]
+    assert controller.level == 2
+
+
+def test_unsustainable_level_is_retried_once_the_load_drops():
+    controller = QualityController(BUDGET, start_level=1)
+    # After frame 1000 the device gets 2.5x faster (e.g. another process stopped)
+    changes = run(controller, lambda level, i: (0.05 if level < 2 else 0.02) / (2.5 if i > 1000 else 1), 3000)
+
+    assert [level for _, level in changes] == [2, 1, 0]
+    assert changes[1][0] > 1000
@@ -0,0 +1,78 @@
+from recording import LandmarkRecorder, LandmarkRecording, replay
+from tracking import Landmark
+
+
+def pointing_hand(x, y):
+    """
+    Right hand with only the index finger open, index tip at (x, y).
+    """
+    hand = [Landmark(0.5, 0.8, 0.0)] * 21
+    hand[3] = Landmark(0.45, 0.7, 0.0)
+    hand[4] = Landmark(0.5, 0.72, 0.0)  # Thumb tip right of its IP joint: closed
+    for tip, pip in [(12, 10), (16, 14), (20, 18)]:
+        hand[pip] = Landmark(0.5, 0.6, 0.0)
+        hand[tip] = Landmark(0.5, 0.65, 0.0)  # Below the PIP: closed
+    hand[6] = Landmark(x, 0.6, 0.0)
+    hand[8] = Landmark(x, y, 0.0)  # Above the PIP: open
+    return hand
+
+
+def test_record_then_replay_gives_the_same_events_every_time(tmp_path):
+    path = str(tmp_path / "session")
+    with LandmarkRecorder(path, chunk_frames=4, metadata={"frame_width": 1000, "frame_height": 1000}) as recorder:
+        for i in range(10):
+            hand = pointing_hand(0.25, 0.5) if i % 2 == 0 else None
+            detected = None if i == 4 else (hand, None)
+            recorder.record(i / 30, (hand, None), [False, True, False, False, False] if hand else [], {},
+                            detected_hands=detected, handedness_scores=(0.9, 0.0))
+
+    recording = LandmarkRecording(path)
+    assert len(recording) == 10
+    assert recording.hands(1) == (None, None)
+    assert recording.flag(4, "predicted")
+    assert not recording.flag(2, "predicted")
+
+    runs = []
+    for _ in range(3):
+        frames = list(replay(recording))
+        assert [i for i, _, _ in frames] == list(range(10))
+        runs.append([states for _, states, _ in frames])
+
+    assert runs[0] == runs[1] == runs[2]
+    assert runs[0][0] == [False, True, False, False, False]
+    assert runs[0][1] == []
+
+
+def test_replay_sends_every_cursor_move_to_the_backend(tmp_path):
+    from injection import RecordingBackend, SynchronousInjector
+
+    path = str(tmp_path / "session")
+    with LandmarkRecorder(path, metadata={"frame_width": 1000, "frame_height": 1000}) as recorder:
+        for i in range(5):
+            hand = pointing_hand(0.25, 0.5)
+            recorder.record(i / 30, (hand, None), [False, True, False, False, False], {}, detected_hands=(hand, None))
+
+    backend = RecordingBackend()
+    list(replay(LandmarkRecording(path), injector=SynchronousInjector(backend)))
+
+    # move_cursor_with_index_finger offsets y by 50 pixels
+    assert backend.events == [("move", 250, 550)] * 5
+
+
+def test_raw_detections_are_kept_apart_from_the_tracked_pose(tmp_path):
+    path = str(tmp_path / "session")
+    with LandmarkRecorder(path) as recorder:
+        # Inference frame: the filtered pose differs slightly from the raw detection
+        recorder.record(0.0, (pointing_hand(0.25, 0.5), None), [False, True, False, False, False], {},
+                        detected_hands=(pointing_hand(0.5, 0.25), None), handedness_scores=(0.75, 0.0))
+        # Predicted frame: only the extrapolated pose exists
+        recorder.record(1 / 30, (pointing_hand(0.375, 0.5), None), [False, True, False, False, False], {})
+
+    recording = LandmarkRecording(path)
+    assert recording.hands(0, "detected")[0][8] == Landmark(0.5, 0.25, 0.0)
+    assert recording.hands(0, "tracked")[0][8] == Landmark(0.25, 0.5, 0.0)
+    assert recording.columns["handedness_scores"][0, 0] == 0.75
+
+    assert recording.flag(1, "predicted")
+    assert recording.hands(1, "detected") == (None, None)
+    assert recording.hands(1, "tracked")[0][8] == Landmark(0.375, 0.5, 0.0)
@@ -0,0 +1,54 @@
+import pytest
+
+from tracking import Landmark, LandmarkPredictor
+
+
+def hand_at(x, y):
+    return [Landmark(x, y, 0.0)] * 21
+
+
+def test_constant_velocity_is_extrapolated_between_detections():
+    predictor = LandmarkPredictor(max_horizon=1.0)
+    for i in range(20):
+        predictor.update(hand_at(0.1 + 0.3 * i * 0.1, 0.5), i * 0.1)
+
+    # Last detection at t=1.9 (x=0.67), moving at 0.3 per second
+    predicted = predictor.predict(2.0)
+    assert predicted[0].x == pytest.approx(0.70, abs=1e-3)
+    assert predicted[0].y == pytest.approx(0.5)
+
+
+def test_extrapolation_stops_at_max_horizon():
+    predictor = LandmarkPredictor(alpha=1.0, beta=1.0, max_horizon=0.25)
+    predictor.update(hand_at(0.0, 0.5), 0.0)
+    predictor.update(hand_at(0.1, 0.5), 0.1)  # Velocity 1.0 per second
+
+    assert predictor.predict(0.35)[0].x == pytest.approx(0.35)
+    assert predictor.predict(5.0)[0].x == pytest.approx(0.35)
+
+
+def test_reset_forgets_the_hand_but_keeps_error_statistics():
+    predictor = LandmarkPredictor()
+    predictor.update(hand_at(0.0, 0.5), 0.0)
+    predictor.update(hand_at(0.1, 0.5), 0.1)
+    predictor.reset()
+
+    assert predictor.predict(0.2) is None
+    assert predictor.error_count == 1
+
+    # The next detection starts a fresh track, so no error is measured for it
+    predictor.update(hand_at(0.9, 0.5), 0.2)
+    assert predictor.error_count == 1
+    assert predictor.predict(0.3)[0].x == pytest.approx(0.9)
+
+
+def test_mean_error_averages_prediction_error_per_detection():
+    predictor = LandmarkPredictor(alpha=1.0, beta=0.0)
+    assert predictor.mean_error() is None
+
+    predictor.update(hand_at(0.0, 0.5), 0.0)
+    predictor.update(hand_at(0.1, 0.5), 0.1)  # Predicted 0.0 (no velocity): error 0.1
+    predictor.update(hand_at(0.4, 0.5), 0.2)  # Predicted 0.1: error 0.3
+
+    assert predictor.last_error == pytest.approx(0.3)
+    assert predictor.mean_error() == pytest.approx(0.2)
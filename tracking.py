@@ -0,0 +1,112 @@
+import time
+from collections import namedtuple
+
+import numpy as np
+
+NUM_LANDMARKS = 21  # MediaPipe hand model keypoints
+
+# Lightweight stand-in for a MediaPipe NormalizedLandmark (same x, y, z attributes)
+Landmark = namedtuple("Landmark", ["x", "y", "z"])
+
+
+def landmarks_to_array(hand_landmarks):
+    """
+    Convert a list of 21 landmarks (anything with x, y, z attributes) to a (21, 3) array.
+    """
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks], dtype=np.float64)
+
+
+def array_to_landmarks(points):
+    """
+    Convert a (21, 3) array back into a list of Landmark tuples usable by detect.py.
+    """
+    return [Landmark(float(x), float(y), float(z)) for x, y, z in points]
+
+
+class LandmarkPredictor:
+    """
+    Constant-velocity (alpha-beta) motion model over the 21 hand landmarks.
+
+    update() is fed every real detection, predict() extrapolates the pose for any
+    time in between so the cursor can move at display rate while inference runs slower.
+    Each update also records how far the prediction was from the real detection.
+    """
+
+    def __init__(self, alpha=0.85, beta=0.3, max_horizon=0.25):
+        self.alpha = alpha              # How much to trust a new detection's position
+        self.beta = beta                # How much to trust a new detection's velocity
+        self.max_horizon = max_horizon  # Seconds we are willing to extrapolate past a detection
+
+        self.position = None  # (21, 3) filtered landmark positions
+        self.velocity = None  # (21, 3) per-landmark velocity, normalized units per second
+        self.timestamp = None
+
+        # Prediction error statistics (mean landmark distance in normalized x/y units)
+        self.last_error = None
+        self.error_sum = 0.0
+        self.error_count = 0
+
+    def reset(self):
+        """
+        Forget the tracked hand (e.g. it left the frame). Error statistics are kept.
+        """
+        self.position = None
+        self.velocity = None
+        self.timestamp = None
+
+    def _extrapolate(self, timestamp):
+        dt = min(max(timestamp - self.timestamp, 0.0), self.max_horizon)
+        return self.position + self.velocity * dt
+
+    def update(self, hand_landmarks, timestamp=None):
+        """
+        Correct the model with a real detection and return the filtered landmarks.
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        measured = landmarks_to_array(hand_landmarks)
+
+        if self.position is None:
+            self.position = measured
+            self.velocity = np.zeros_like(measured)
+            self.timestamp = timestamp
+            return array_to_landmarks(self.position)
+
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            self.position = measured
+            self.timestamp = timestamp
+            return array_to_landmarks(self.position)
+
+        predicted = self._extrapolate(timestamp)
+
+        # Measure how far off the extrapolation was before correcting it
+        error = float(np.mean(np.linalg.norm(measured[:, :2] - predicted[:, :2], axis=1)))
+        self.last_error = error
+        self.error_sum += error
+        self.error_count += 1
+
+        residual = measured - predicted
+        self.position = predicted + self.alpha * residual
+        self.velocity = self.velocity + (self.beta / dt) * residual
+        self.timestamp = timestamp
+
+        return array_to_landmarks(self.position)
+
+    def predict(self, timestamp=None):
+        """
+        Extrapolate the landmarks to the given time. Returns None if nothing is tracked.
+        """
+        if self.position is None:
+            return None
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        return array_to_landmarks(self._extrapolate(timestamp))
+
+    def mean_error(self):
+        """
+        Average prediction error over all detections seen so far, or None if unmeasured.
+        """
+        if self.error_count == 0:
+            return None
+        return self.error_sum / self.error_count